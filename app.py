@@ -1,93 +1,602 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, render_template
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-import json
+from flask_compress import Compress
+from whitenoise import WhiteNoise
+from celery import Celery
+from celery.exceptions import Retry as CeleryRetry
+from decimal import Decimal
+import orjson
+import msgspec
 import os
-import requests
-from datetime import datetime
+import httpx
+import time
 import uuid
+from types import MappingProxyType
+from typing import List
+import itertools
+from collections import deque
 from dotenv import load_dotenv
 import threading
+import queue
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import atexit
+import mmap
+import sqlite3
 
 # Carregar variáveis de ambiente
 load_dotenv('.env')
 
+ISO_FMT = "%Y-%m-%dT%H:%M:%S"
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_OMIT_MICROSECONDS
+
+def utc_timestamp():
+    """Horário atual em UTC no formato RFC 3339 (precisão de segundos)"""
+    return time.strftime(ISO_FMT, time.gmtime()) + "Z"
+
+def _orjson_default(obj):
+    """Tipos extras que o orjson não serializa nativamente"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Objeto do tipo {type(obj).__name__} não é serializável em JSON")
+
+class OrjsonProvider(JSONProvider):
+    """Provider JSON do Flask baseado em orjson (datetime e UUID são nativos)"""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Compressão das respostas JSON grandes (o stream SSE não é comprimido para não ser bufferizado)
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
+
+# Arquivos estáticos servidos pelo WhiteNoise, antes de chegar às rotas do Flask
+app.wsgi_app = WhiteNoise(
+    app.wsgi_app,
+    root=os.path.join(app.root_path, 'static'),
+    prefix='static/',
+    max_age=7 * 24 * 60 * 60
+)
+
 # Configurações
+DB_FILE = 'whatsapp_data.db'
 DATA_FILE = 'whatsapp_data.json'
 API_KEY = os.getenv('GEMINI_API_KEY')
 GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+GEMINI_STREAM_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:streamGenerateContent?alt=sse"
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+
+# Fila de tarefas para as respostas do Gemini (worker: celery -A app.celery worker --concurrency=4)
+celery = Celery('whatsapp', broker=CELERY_BROKER_URL)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    conv_id TEXT,
+    who TEXT,
+    text TEXT,
+    ts TEXT,
+    status TEXT,
+    seq INTEGER,
+    reply_to TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_messages_conv_seq ON messages (conv_id, seq);
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+DEFAULT_SETTINGS = {
+    "currentConvId": "conv-default",
+    "simulateBot": False,
+    "geminiEnabled": False
+}
+
+BOOL_SETTINGS = ("simulateBot", "geminiEnabled")
+
+# Quantidade de mensagens recentes enviadas como contexto ao Gemini
+CONTEXT_WINDOW = 6
+
+# Máximo de escritas aplicadas em uma mesma transação pela thread de escrita
+WRITE_BATCH_SIZE = 100
+
+# Tempo máximo (s) que uma requisição espera a thread de escrita confirmar a gravação
+WRITE_TIMEOUT = 10
+
+class ConversationNotFound(Exception):
+    """A conversa não existe (ou foi removida antes da gravação)"""
+
+class AlreadyReplied(Exception):
+    """A mensagem do usuário já recebeu resposta (auto-resposta ou outro stream)"""
 
 class WhatsAppManager:
-    def __init__(self, data_file):
-        self.data_file = data_file
+    def __init__(self, db_file, legacy_file=None):
+        self.db_file = db_file
+        self.legacy_file = legacy_file
+        self._reset_state()
+        self.conn.executescript(SCHEMA)
+        self._migrate_schema()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO kv (key, value) VALUES (?, ?)",
+            [*DEFAULT_SETTINGS.items(), ("version", 0)]
+        )
+        atexit.register(self.close)
+        # Processos filhos (workers do Celery) não herdam a thread de escrita nem
+        # podem reutilizar a conexão SQLite do processo pai
+        os.register_at_fork(after_in_child=self._reset_state)
+    
+    def _reset_state(self):
+        self.lock = threading.RLock()
+        self._cache = None
+        self._data_version = None
+        self._version = 0
+        self._ctx_cache = {}
+        self._status_json = None
+        self._ops = queue.Queue()
+        self._writer = None
+        # Lock próprio para (re)iniciar a thread de escrita: self.lock fica preso
+        # durante cada lote e não pode atrasar quem só quer enfileirar
+        self._writer_lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+    
+    def _migrate_schema(self):
+        """Adiciona a coluna reply_to em bancos criados antes dela"""
+        # IMMEDIATE: vários workers podem iniciar ao mesmo tempo
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(messages)")}
+            if "reply_to" not in columns:
+                self.conn.execute("ALTER TABLE messages ADD COLUMN reply_to TEXT")
+            # Uma resposta por mensagem (o NULL das mensagens que não são respostas não conflita)
+            self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_messages_reply_to ON messages (reply_to)")
+            self.conn.execute("COMMIT")
+        except sqlite3.Error:
+            self.conn.execute("ROLLBACK")
+            raise
+    
+    def close(self):
+        """Faz o checkpoint do WAL e fecha a conexão"""
+        with self.lock:
+            try:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self.conn.close()
+            except sqlite3.Error:
+                pass
+    
+    def _write(self, op, *args):
+        """Enfileira uma escrita para a thread de escrita e aguarda o resultado"""
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._writer_loop, name="whatsapp-writer", daemon=True)
+                self._writer.start()
+        future = Future()
+        self._ops.put((op, args, future))
+        try:
+            return future.result(timeout=WRITE_TIMEOUT)
+        except FutureTimeoutError:
+            # Ainda na fila: cancelar para não gravar depois de o cliente receber o erro.
+            # Se a thread de escrita já começou a aplicá-la, esperar o resultado do lote
+            if future.cancel():
+                raise sqlite3.OperationalError("Tempo esgotado aguardando a gravação") from None
+            return future.result()
+    
+    def _writer_loop(self):
+        """Aplica as escritas pendentes em lote: uma transação (e um commit) por lote"""
+        while True:
+            batch = [self._ops.get()]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._ops.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                results = self._apply_batch(batch)
+            except Exception as e:
+                # Nada escapa do loop: a thread precisa continuar atendendo a fila
+                results = [(future, None, e) for _, _, future in batch]
+            
+            for future, result, error in results:
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+    
+    def _apply_batch(self, batch):
+        with self.lock:
+            results = []
+            try:
+                data = self.load_data()
+                changed = False
+                self.conn.execute("BEGIN")
+                for op, args, future in batch:
+                    # Cancelada por tempo esgotado em _write: quem pediu já recebeu o erro
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    # Savepoint por operação: uma falha não desfaz as demais do lote
+                    self.conn.execute("SAVEPOINT op")
+                    changes_before = self.conn.total_changes
+                    try:
+                        results.append((future, op(data, *args), None))
+                        self.conn.execute("RELEASE op")
+                        # Só conta operações que de fato alteraram linhas (ex.: INSERT OR IGNORE
+                        # da conversa padrão ou limpar uma conversa vazia não contam)
+                        changed = changed or self.conn.total_changes != changes_before
+                    except Exception as e:
+                        self.conn.execute("ROLLBACK TO op")
+                        self.conn.execute("RELEASE op")
+                        results.append((future, None, e))
+                if changed:
+                    # Versão compartilhada entre processos, usada como ETag
+                    self.conn.execute("UPDATE kv SET value = value + 1 WHERE key = 'version'")
+                    version = self._read_version()
+                else:
+                    version = self._version
+                self.conn.execute("COMMIT")
+                self._version = version
+            except Exception as e:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+                # O cache pode já ter recebido as alterações: descartar e reler do banco
+                self._cache = None
+                results = [(future, None, e) for _, _, future in batch]
+            return results
+    
+    @staticmethod
+    def _row_to_message(row):
+        msg_id, who, text, ts, status = row
+        return {"id": msg_id, "who": who, "text": text, "ts": ts, "status": status}
+    
+    def _insert_message(self, conversation_id, message, in_reply_to=None):
+        # A checagem de existência vai no próprio INSERT: uma conversa removida
+        # entre a validação da rota e a gravação não recebe mensagens órfãs
+        sql = (
+            "INSERT INTO messages (id, conv_id, who, text, ts, status, seq, reply_to) "
+            "SELECT ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM messages WHERE conv_id = ?), ? "
+            "WHERE EXISTS (SELECT 1 FROM conversations WHERE id = ?)"
+        )
+        params = [message["id"], conversation_id, message["who"], message["text"],
+                  message["ts"], message["status"], conversation_id, in_reply_to, conversation_id]
+        if in_reply_to is not None:
+            # Resposta só entra se a mensagem ainda não tiver outra resposta gravada
+            sql += " AND NOT EXISTS (SELECT 1 FROM messages WHERE reply_to = ?)"
+            params.append(in_reply_to)
+        
+        try:
+            inserted = self.conn.execute(sql, params).rowcount
+        except sqlite3.IntegrityError:
+            # Índice único em reply_to: outro processo gravou a resposta primeiro
+            raise AlreadyReplied(in_reply_to) from None
+        if not inserted:
+            exists = self.conn.execute(
+                "SELECT 1 FROM conversations WHERE id = ?", (conversation_id,)
+            ).fetchone()
+            if exists is None:
+                raise ConversationNotFound(conversation_id)
+            raise AlreadyReplied(in_reply_to)
+    
+    def _read_setting(self, key):
+        row = self.conn.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        value = row[0] if row else DEFAULT_SETTINGS[key]
+        return bool(value) if key in BOOL_SETTINGS else value
+    
+    def _read_version(self):
+        row = self.conn.execute("SELECT value FROM kv WHERE key = 'version'").fetchone()
+        return row[0] if row else 0
+    
+    def _read_state(self):
+        """Lê o estado completo do banco"""
+        conversations = {}
+        for conv_id, name in self.conn.execute("SELECT id, name FROM conversations ORDER BY rowid"):
+            conversations[conv_id] = {"id": conv_id, "name": name, "messages": []}
+        
+        rows = self.conn.execute(
+            "SELECT conv_id, id, who, text, ts, status FROM messages ORDER BY conv_id, seq"
+        )
+        for row in rows:
+            conversation = conversations.get(row[0])
+            if conversation is not None:
+                conversation["messages"].append(self._row_to_message(row[1:]))
+        
+        data = {"conversations": conversations}
+        for key in DEFAULT_SETTINGS:
+            data[key] = self._read_setting(key)
+        return data
     
     def load_data(self):
-        """Carrega os dados do arquivo JSON com valores padrão"""
-        default_data = {
-            "conversations": {},
-            "currentConvId": "conv-default",
-            "simulateBot": False,
-            "geminiEnabled": False
-        }
+        """Retorna o estado em memória (somente leitura para quem chama).
         
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Garantir que todas as chaves existam
-                    for key, value in default_data.items():
-                        if key not in data:
-                            data[key] = value
-                    return data
-            except (json.JSONDecodeError, KeyError):
-                # Se o arquivo estiver corrompido, recriar
-                return default_data.copy()
-        return default_data.copy()
-    
-    def save_data(self, data):
-        """Salva os dados no arquivo JSON"""
+        O cache é carregado uma vez e mantido em dia pelas escritas deste
+        processo; `PRAGMA data_version` indica quando outra conexão alterou
+        o banco e o cache precisa ser recarregado.
+        """
+        with self.lock:
+            data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._cache is None or data_version != self._data_version:
+                self._cache = self._read_state()
+                self._version = self._read_version()
+                self._data_version = data_version
+                self._ctx_cache.clear()
+                self._status_json = None
+            return self._cache
+    
+    def snapshot(self):
+        """Retorna (estado, etag); o ETag muda a cada escrita que altera dados, em qualquer processo"""
+        with self.lock:
+            data = self.load_data()
+            return data, str(self._version)
+    
+    def gemini_status_json(self, api_configured):
+        """Corpo pronto de /api/gemini/status; refeito só quando as configurações mudam"""
+        with self.lock:
+            data = self.load_data()
+            if self._status_json is None:
+                self._status_json = orjson.dumps({
+                    "geminiEnabled": data["geminiEnabled"],
+                    "apiConfigured": api_configured
+                })
+            return self._status_json
+    
+    def get_setting(self, key):
+        """Lê uma configuração do estado em memória"""
+        return self.load_data()[key]
+    
+    def conversation_exists(self, conversation_id):
+        return conversation_id in self.load_data()["conversations"]
+    
+    def get_conversation(self, conversation_id):
+        """Retorna uma conversa com suas mensagens, ou None"""
+        return self.load_data()["conversations"].get(conversation_id)
+    
+    def get_messages(self, conversation_id):
+        """Retorna as mensagens de uma conversa em ordem, ou None se ela não existir"""
+        conversation = self.get_conversation(conversation_id)
+        return conversation["messages"] if conversation is not None else None
+    
+    def recent_context(self, conversation_id):
+        """Retorna o deque com as últimas CONTEXT_WINDOW mensagens da conversa"""
+        with self.lock:
+            # Consultar a conversa primeiro: isso pode invalidar o cache de contexto
+            conversation = self.get_conversation(conversation_id)
+            context = self._ctx_cache.get(conversation_id)
+            if context is None:
+                messages = conversation["messages"] if conversation is not None else []
+                context = deque(messages[-CONTEXT_WINDOW:], maxlen=CONTEXT_WINDOW)
+                self._ctx_cache[conversation_id] = context
+            return context
+    
+    def _op_create_conversation(self, data, conversation):
+        self.conn.execute(
+            "INSERT INTO conversations (id, name) VALUES (?, ?)",
+            (conversation["id"], conversation["name"])
+        )
+        conv_id = conversation["id"]
+        data["conversations"][conv_id] = {"id": conv_id, "name": conversation["name"], "messages": []}
+    
+    def _op_add_message(self, data, conversation_id, message, in_reply_to=None):
+        self._insert_message(conversation_id, message, in_reply_to)
+        conversation = data["conversations"].get(conversation_id)
+        if conversation is not None:
+            conversation["messages"].append(message)
+        context = self._ctx_cache.get(conversation_id)
+        if context is not None:
+            context.append(message)
+    
+    def _op_clear_messages(self, data, conversation_id):
+        self.conn.execute("DELETE FROM messages WHERE conv_id = ?", (conversation_id,))
+        conversation = data["conversations"].get(conversation_id)
+        if conversation is not None:
+            conversation["messages"] = []
+        self._ctx_cache.pop(conversation_id, None)
+    
+    def _op_delete_conversation(self, data, conversation_id):
+        self.conn.execute("DELETE FROM messages WHERE conv_id = ?", (conversation_id,))
+        self.conn.execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
+        self.conn.execute(
+            "UPDATE kv SET value = 'conv-default' WHERE key = 'currentConvId' AND value = ?",
+            (conversation_id,)
+        )
+        data["conversations"].pop(conversation_id, None)
+        self._ctx_cache.pop(conversation_id, None)
+        if data["currentConvId"] == conversation_id:
+            data["currentConvId"] = "conv-default"
+    
+    def _op_create_default_conversation(self, data):
+        # INSERT OR IGNORE: só quem de fato criou a conversa insere a mensagem de boas-vindas
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO conversations (id, name) VALUES ('conv-default', ?)",
+            ("Conversa com Gemini AI",)
+        )
+        if cursor.rowcount:
+            welcome = {
+                "id": uuid.uuid4().hex,
+                "who": "their",
+                "text": "Olá! Sou o Gemini AI. Como posso ajudá-lo hoje?",
+                "ts": utc_timestamp(),
+                "status": "delivered"
+            }
+            self._insert_message("conv-default", welcome)
+            data["conversations"]["conv-default"] = {
+                "id": "conv-default",
+                "name": "Conversa com Gemini AI",
+                "messages": [welcome]
+            }
+    
+    def _op_toggle_setting(self, data, key):
+        self.conn.execute("UPDATE kv SET value = NOT value WHERE key = ?", (key,))
+        data[key] = self._read_setting(key)
+        self._status_json = None
+        return data[key]
+    
+    def create_conversation(self, conversation):
+        """Insere uma nova conversa (sem mensagens)"""
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self._write(self._op_create_conversation, conversation)
             return True
-        except Exception as e:
+        except sqlite3.Error as e:
+            print(f"Erro ao salvar dados: {e}")
+            return False
+    
+    def add_message(self, conversation_id, message, in_reply_to=None):
+        """Adiciona uma mensagem ao final da conversa.
+        
+        Levanta ConversationNotFound se a conversa não existir e, quando
+        `in_reply_to` (id da mensagem respondida) é informado, AlreadyReplied
+        se aquela mensagem já tiver uma resposta gravada.
+        """
+        try:
+            self._write(self._op_add_message, conversation_id, message, in_reply_to)
+            return True
+        except sqlite3.Error as e:
             print(f"Erro ao salvar dados: {e}")
             return False
     
+    def clear_messages(self, conversation_id):
+        """Remove todas as mensagens de uma conversa"""
+        try:
+            self._write(self._op_clear_messages, conversation_id)
+            return True
+        except sqlite3.Error as e:
+            print(f"Erro ao salvar dados: {e}")
+            return False
+    
+    def delete_conversation(self, conversation_id):
+        """Remove a conversa, suas mensagens e reaponta a conversa atual se necessário"""
+        try:
+            self._write(self._op_delete_conversation, conversation_id)
+            return True
+        except sqlite3.Error as e:
+            print(f"Erro ao salvar dados: {e}")
+            return False
+    
+    def toggle_setting(self, key):
+        """Inverte uma configuração booleana e retorna o novo valor, ou None em caso de erro"""
+        try:
+            return self._write(self._op_toggle_setting, key)
+        except sqlite3.Error as e:
+            print(f"Erro ao salvar dados: {e}")
+            return None
+    
+    def _import_legacy_data(self):
+        """Importa o antigo whatsapp_data.json para o banco, uma única vez"""
+        if not self.legacy_file or not os.path.exists(self.legacy_file):
+            return
+        try:
+            # Ler via mmap evita uma segunda cópia em bytes de arquivos grandes
+            with open(self.legacy_file, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as buffer:
+                    data = orjson.loads(buffer)
+        except (orjson.JSONDecodeError, ValueError):
+            # Arquivo vazio ou corrompido: nada a importar (o arquivo não é alterado)
+            return
+        
+        with self.lock:
+            # IMMEDIATE + nova verificação: vários workers podem iniciar ao mesmo tempo
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self.conn.execute("SELECT 1 FROM conversations LIMIT 1").fetchone() is not None:
+                    self.conn.execute("ROLLBACK")
+                    return
+                for conv_id, conversation in data.get("conversations", {}).items():
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO conversations (id, name) VALUES (?, ?)",
+                        (conv_id, conversation.get("name", ""))
+                    )
+                    for seq, msg in enumerate(conversation.get("messages", []), start=1):
+                        self.conn.execute(
+                            "INSERT OR IGNORE INTO messages (id, conv_id, who, text, ts, status, seq) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (msg["id"], conv_id, msg["who"], msg["text"],
+                             msg.get("ts"), msg.get("status"), seq)
+                        )
+                for key in DEFAULT_SETTINGS:
+                    if key in data:
+                        self.conn.execute(
+                            "UPDATE kv SET value = ? WHERE key = ?", (data[key], key)
+                        )
+                self.conn.execute("UPDATE kv SET value = value + 1 WHERE key = 'version'")
+                self.conn.execute("COMMIT")
+                self._cache = None
+            except (sqlite3.Error, KeyError, TypeError, AttributeError) as e:
+                # Arquivo legado inválido: começar com o banco vazio
+                self.conn.execute("ROLLBACK")
+                print(f"Erro ao importar {self.legacy_file}: {e}")
+    
     def init_default_data(self):
         """Inicializa dados padrão se não existirem"""
-        data = self.load_data()
+        if self.conn.execute("SELECT 1 FROM conversations LIMIT 1").fetchone() is None:
+            self._import_legacy_data()
         
         # Garantir que a conversa padrão existe
-        if "conv-default" not in data["conversations"]:
-            data["conversations"]["conv-default"] = {
-                "id": "conv-default",
-                "name": "Conversa com Gemini AI",
-                "messages": [
-                    {
-                        "id": str(uuid.uuid4()),
-                        "who": "their",
-                        "text": "Olá! Sou o Gemini AI. Como posso ajudá-lo hoje?",
-                        "ts": datetime.now().isoformat(),
-                        "status": "delivered"
-                    }
-                ]
-            }
+        self._write(self._op_create_default_conversation)
         
-        # Garantir valores padrão
-        data["currentConvId"] = data.get("currentConvId", "conv-default")
-        data["simulateBot"] = data.get("simulateBot", False)
-        data["geminiEnabled"] = data.get("geminiEnabled", True)
-        
-        self.save_data(data)
-        return data
+        return self.load_data()
 
 class GeminiAIManager:
-    def __init__(self, api_key, base_url):
+    _HEADERS = MappingProxyType({'Content-Type': 'application/json'})
+    _GEN_CONFIG = MappingProxyType({
+        "temperature": 0.7,
+        "topK": 40,
+        "topP": 0.95,
+        "maxOutputTokens": 1024,
+    })
+    # Corpo da requisição pré-serializado; a cada chamada só o texto é codificado
+    _BODY_PREFIX = b'{"contents":[{"parts":[{"text":'
+    _BODY_SUFFIX = b'}]}],"generationConfig":' + orjson.dumps(dict(_GEN_CONFIG)) + b'}'
+    
+    def __init__(self, api_key, base_url, stream_url):
         self.api_key = api_key
         self.base_url = base_url
+        self.stream_url = stream_url
+        
+        # Cliente HTTP/2 compartilhado: várias requisições multiplexadas na mesma conexão
+        headers = dict(self._HEADERS)
+        if api_key:
+            headers['x-goog-api-key'] = api_key
+        self.client = httpx.Client(
+            headers=headers,
+            timeout=30,
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=2,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        )
+    
+    def _build_body(self, prompt, conversation_context=None):
+        """Monta o corpo JSON (bytes) com as últimas CONTEXT_WINDOW mensagens de contexto"""
+        if not isinstance(conversation_context, deque) or conversation_context.maxlen != CONTEXT_WINDOW:
+            conversation_context = deque(conversation_context or (), maxlen=CONTEXT_WINDOW)
+        
+        if conversation_context:
+            full_prompt = "\n".join(itertools.chain(
+                (f"{'user' if m['who'] == 'mine' else 'model'}: {m['text']}" for m in conversation_context),
+                (f"user: {prompt}",)
+            ))
+        else:
+            full_prompt = prompt
+        
+        return self._BODY_PREFIX + orjson.dumps(full_prompt) + self._BODY_SUFFIX
     
     def generate_response(self, prompt, conversation_context=None):
         """Gera resposta usando a API Gemini"""
@@ -95,37 +604,10 @@ class GeminiAIManager:
             return {"error": "API key não configurada"}
         
         try:
-            # Preparar contexto da conversa
-            context_parts = []
-            if conversation_context:
-                for msg in conversation_context[-6:]:
-                    role = "user" if msg["who"] == "mine" else "model"
-                    context_parts.append(f"{role}: {msg['text']}")
-            
-            full_prompt = "\n".join(context_parts + [f"user: {prompt}"]) if context_parts else prompt
-            
-            headers = {
-                'Content-Type': 'application/json',
-                'x-goog-api-key': self.api_key
-            }
-            
-            payload = {
-                "contents": [{
-                    "parts": [{
-                        "text": full_prompt
-                    }]
-                }],
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 1024,
-                }
-            }
-            
-            response = requests.post(self.base_url, json=payload, headers=headers, timeout=30)
+            body = self._build_body(prompt, conversation_context)
+            response = self.client.post(self.base_url, content=body)
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             
             if 'candidates' in result and len(result['candidates']) > 0:
                 text = result['candidates'][0]['content']['parts'][0]['text']
@@ -136,288 +618,391 @@ class GeminiAIManager:
             else:
                 return {"error": "Nenhuma resposta do Gemini"}
                 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPStatusError as e:
+            # Só vale repetir em limite de taxa (429) ou falha do servidor (5xx);
+            # demais 4xx (chave inválida, requisição inválida) falham na hora
+            status = e.response.status_code
+            return {"error": f"Erro na API Gemini: {str(e)}", "retryable": status == 429 or status >= 500}
+        except httpx.TransportError as e:
+            return {"error": f"Erro de conexão: {str(e)}", "retryable": True}
+        except httpx.HTTPError as e:
             return {"error": f"Erro de conexão: {str(e)}"}
         except Exception as e:
             return {"error": f"Erro na API Gemini: {str(e)}"}
+    
+    def stream_response(self, prompt, conversation_context=None):
+        """Gera a resposta em partes via streamGenerateContent (SSE), produzindo cada trecho de texto"""
+        if not self.api_key:
+            raise RuntimeError("API key não configurada")
+        
+        body = self._build_body(prompt, conversation_context)
+        with self.client.stream("POST", self.stream_url, content=body) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith("data: "):
+                    continue
+                chunk = orjson.loads(line[6:])
+                for candidate in chunk.get("candidates", [])[:1]:
+                    for part in candidate.get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
 
-# Inicializar gerenciadores
-whatsapp_mgr = WhatsAppManager(DATA_FILE)
-gemini_mgr = GeminiAIManager(API_KEY, GEMINI_URL)
+# Inicializar gerenciadores (na importação: cada worker do gunicorn/Celery tem seu próprio estado)
+whatsapp_mgr = WhatsAppManager(DB_FILE, legacy_file=DATA_FILE)
+whatsapp_mgr.init_default_data()
+gemini_mgr = GeminiAIManager(API_KEY, GEMINI_URL, GEMINI_STREAM_URL)
 
-def generate_gemini_reply(conversation_id, user_message, context_messages):
-    """Função para gerar resposta do Gemini em background"""
+@celery.task(bind=True, max_retries=3)
+def generate_gemini_reply(self, conversation_id, user_message, context_messages, reply_to=None):
+    """Tarefa Celery que gera a resposta do Gemini em background"""
     with app.app_context():
         try:
             gemini_response = gemini_mgr.generate_response(user_message, context_messages)
             
+            if gemini_response.get("retryable"):
+                # Falha de rede, 429 ou 5xx: tentar de novo com backoff exponencial
+                raise self.retry(countdown=2 ** self.request.retries)
+            
             if gemini_response.get("status") == "success":
                 reply_message = {
-                    "id": str(uuid.uuid4()),
+                    "id": uuid.uuid4().hex,
                     "who": "their",
                     "text": gemini_response["response"],
-                    "ts": datetime.now().isoformat(),
+                    "ts": utc_timestamp(),
                     "status": "delivered"
                 }
                 
-                # Atualizar dados e salvar
-                data = whatsapp_mgr.load_data()
-                if conversation_id in data["conversations"]:
-                    data["conversations"][conversation_id]["messages"].append(reply_message)
-                    whatsapp_mgr.save_data(data)
+                # Salvar a resposta se a conversa ainda existir e ninguém respondeu antes
+                try:
+                    whatsapp_mgr.add_message(conversation_id, reply_message, reply_to)
+                except (ConversationNotFound, AlreadyReplied):
+                    pass
+        except CeleryRetry:
+            raise
         except Exception as e:
             print(f"Erro ao gerar resposta Gemini: {e}")
 
+# Corpos das requisições, validados na decodificação
+class NewConversation(msgspec.Struct):
+    name: str
+
+class NewMessage(msgspec.Struct):
+    who: str
+    text: str
+    status: str = "sent"
+    # O cliente vai buscar a resposta em /stream: não enfileirar a auto-resposta
+    stream: bool = False
+
+class GenerateRequest(msgspec.Struct):
+    prompt: str
+    context: List[dict] = msgspec.field(default_factory=list)
+
+def ojsonify(obj, status=200):
+    """Como o jsonify, mas entrega os bytes do orjson direto (sem o desvio bytes → str → bytes)"""
+    return Response(
+        orjson.dumps(obj, default=_orjson_default, option=ORJSON_OPTIONS),
+        status=status,
+        mimetype='application/json'
+    )
+
+def conditional_json(obj, etag):
+    """Responde 304 sem serializar nada se o cliente já tem esta versão"""
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = ojsonify(obj)
+    response.set_etag(etag, weak=True)
+    return response
+
 # Rotas da API
 @app.route('/api/conversations', methods=['GET'])
 def get_conversations():
     """Retorna todas as conversas"""
     try:
-        data = whatsapp_mgr.load_data()
-        return jsonify(data["conversations"])
+        data, etag = whatsapp_mgr.snapshot()
+        return conditional_json(data["conversations"], etag)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/conversations/<conversation_id>', methods=['GET'])
 def get_conversation(conversation_id):
     """Retorna uma conversa específica"""
     try:
-        data = whatsapp_mgr.load_data()
-        conversation = data["conversations"].get(conversation_id)
+        conversation = whatsapp_mgr.get_conversation(conversation_id)
         if conversation:
-            return jsonify(conversation)
-        return jsonify({"error": "Conversa não encontrada"}), 404
+            return ojsonify(conversation)
+        return ojsonify({"error": "Conversa não encontrada"}, 404)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/conversations', methods=['POST'])
 def create_conversation():
     """Cria uma nova conversa"""
     try:
-        data = whatsapp_mgr.load_data()
-        new_conv = request.json
+        try:
+            new_conv = msgspec.json.decode(request.get_data(), type=NewConversation)
+        except msgspec.DecodeError:
+            new_conv = None
         
-        if not new_conv or not new_conv.get("name"):
-            return jsonify({"error": "Nome da conversa é obrigatório"}), 400
+        if not new_conv or not new_conv.name:
+            return ojsonify({"error": "Nome da conversa é obrigatório"}, 400)
         
-        conv_id = f"conv-{uuid.uuid4()}"
+        conv_id = f"conv-{uuid.uuid4().hex}"
         conversation = {
             "id": conv_id,
-            "name": new_conv["name"],
+            "name": new_conv.name,
             "messages": []
         }
         
-        data["conversations"][conv_id] = conversation
-        if whatsapp_mgr.save_data(data):
-            return jsonify(conversation), 201
+        if whatsapp_mgr.create_conversation(conversation):
+            return ojsonify(conversation, 201)
         else:
-            return jsonify({"error": "Erro ao salvar conversa"}), 500
+            return ojsonify({"error": "Erro ao salvar conversa"}, 500)
             
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/conversations/<conversation_id>/messages', methods=['POST'])
 def add_message(conversation_id):
     """Adiciona uma mensagem a uma conversa"""
     try:
-        data = whatsapp_mgr.load_data()
-        
-        if conversation_id not in data["conversations"]:
-            return jsonify({"error": "Conversa não encontrada"}), 404
+        if not whatsapp_mgr.conversation_exists(conversation_id):
+            return ojsonify({"error": "Conversa não encontrada"}, 404)
         
-        message_data = request.json
-        if not message_data:
-            return jsonify({"error": "Dados da mensagem são obrigatórios"}), 400
-        
-        required_fields = ["who", "text"]
-        for field in required_fields:
-            if field not in message_data:
-                return jsonify({"error": f"Campo '{field}' é obrigatório"}), 400
+        try:
+            message_data = msgspec.json.decode(request.get_data(), type=NewMessage)
+        except msgspec.ValidationError as e:
+            return ojsonify({"error": f"Dados da mensagem inválidos: {e}"}, 400)
+        except msgspec.DecodeError:
+            return ojsonify({"error": "Dados da mensagem são obrigatórios"}, 400)
         
         message = {
-            "id": str(uuid.uuid4()),
-            "who": message_data["who"],
-            "text": message_data["text"],
-            "ts": datetime.now().isoformat(),
-            "status": message_data.get("status", "sent")
+            "id": uuid.uuid4().hex,
+            "who": message_data.who,
+            "text": message_data.text,
+            "ts": utc_timestamp(),
+            "status": message_data.status
         }
         
-        data["conversations"][conversation_id]["messages"].append(message)
-        
         # Salvar primeiro a mensagem do usuário
-        if whatsapp_mgr.save_data(data):
+        try:
+            saved = whatsapp_mgr.add_message(conversation_id, message)
+        except ConversationNotFound:
+            return ojsonify({"error": "Conversa não encontrada"}, 404)
+        
+        if saved:
             # Resposta automática do Gemini se estiver ativado
-            if (message_data["who"] == "mine" and 
-                data.get("geminiEnabled", False)):
+            if (message_data.who == "mine" and not message_data.stream and
+                whatsapp_mgr.get_setting("geminiEnabled")):
                 
-                # Obter contexto para o Gemini
-                conversation = data["conversations"][conversation_id]
-                context_messages = conversation["messages"][-5:]
+                # Obter contexto para o Gemini, sem a própria mensagem (ela vai como prompt),
+                # como em stream_reply
+                context_messages = list(whatsapp_mgr.recent_context(conversation_id))
+                if context_messages and context_messages[-1]["id"] == message["id"]:
+                    context_messages.pop()
                 
                 # Gerar resposta em background com delay
-                timer = threading.Timer(2.0, generate_gemini_reply, 
-                                      [conversation_id, message_data["text"], context_messages])
-                timer.start()
+                try:
+                    generate_gemini_reply.apply_async(
+                        args=[conversation_id, message_data.text, context_messages, message["id"]],
+                        countdown=2
+                    )
+                except Exception as e:
+                    # A mensagem do usuário já foi salva; só a resposta automática é perdida
+                    print(f"Erro ao enfileirar resposta Gemini: {e}")
             
-            return jsonify(message), 201
+            return ojsonify(message, 201)
         else:
-            return jsonify({"error": "Erro ao salvar mensagem"}), 500
+            return ojsonify({"error": "Erro ao salvar mensagem"}, 500)
             
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/conversations/<conversation_id>/messages', methods=['GET'])
 def get_messages(conversation_id):
     """Retorna todas as mensagens de uma conversa"""
     try:
-        data = whatsapp_mgr.load_data()
+        messages = whatsapp_mgr.get_messages(conversation_id)
         
-        if conversation_id not in data["conversations"]:
-            return jsonify({"error": "Conversa não encontrada"}), 404
+        if messages is None:
+            return ojsonify({"error": "Conversa não encontrada"}, 404)
         
-        return jsonify(data["conversations"][conversation_id]["messages"])
+        return ojsonify(messages)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
+
+@app.route('/api/conversations/<conversation_id>/stream', methods=['GET'])
+def stream_reply(conversation_id):
+    """Gera a resposta do Gemini para a última mensagem do usuário via Server-Sent Events"""
+    try:
+        if not whatsapp_mgr.conversation_exists(conversation_id):
+            return ojsonify({"error": "Conversa não encontrada"}, 404)
+        
+        # A aba pode ter um geminiEnabled desatualizado: vale a configuração salva
+        if not whatsapp_mgr.get_setting("geminiEnabled"):
+            return ojsonify({"error": "Gemini está desativado"}, 400)
+        
+        context = list(whatsapp_mgr.recent_context(conversation_id))
+        if not context or context[-1]["who"] != "mine":
+            return ojsonify({"error": "Nenhuma mensagem do usuário para responder"}, 400)
+        
+        prompt_message = context.pop()
+        prompt = prompt_message["text"]
+    except Exception as e:
+        return ojsonify({"error": str(e)}, 500)
+    
+    def events():
+        parts = []
+        try:
+            for text in gemini_mgr.stream_response(prompt, context):
+                parts.append(text)
+                yield b"data: " + orjson.dumps({"text": text}) + b"\n\n"
+            
+            if not parts:
+                yield b"event: error\ndata: " + orjson.dumps({"error": "Nenhuma resposta do Gemini"}) + b"\n\n"
+                return
+            
+            # Persistir a resposta completa uma única vez, ao final do stream
+            reply_message = {
+                "id": uuid.uuid4().hex,
+                "who": "their",
+                "text": "".join(parts),
+                "ts": utc_timestamp(),
+                "status": "delivered"
+            }
+            try:
+                whatsapp_mgr.add_message(conversation_id, reply_message, in_reply_to=prompt_message["id"])
+            except ConversationNotFound:
+                yield b"event: error\ndata: " + orjson.dumps({"error": "Conversa não encontrada"}) + b"\n\n"
+                return
+            except AlreadyReplied:
+                yield b"event: error\ndata: " + orjson.dumps({"error": "Esta mensagem já foi respondida"}) + b"\n\n"
+                return
+            yield b"event: done\ndata: " + orjson.dumps(reply_message) + b"\n\n"
+        except Exception as e:
+            yield b"event: error\ndata: " + orjson.dumps({"error": str(e)}) + b"\n\n"
+    
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/api/conversations/<conversation_id>', methods=['DELETE'])
 def delete_conversation(conversation_id):
     """Remove uma conversa"""
     try:
-        data = whatsapp_mgr.load_data()
-        
-        if conversation_id not in data["conversations"]:
-            return jsonify({"error": "Conversa não encontrada"}), 404
+        if not whatsapp_mgr.conversation_exists(conversation_id):
+            return ojsonify({"error": "Conversa não encontrada"}, 404)
         
         if conversation_id == "conv-default":
-            return jsonify({"error": "Não é possível deletar a conversa padrão"}), 400
+            return ojsonify({"error": "Não é possível deletar a conversa padrão"}, 400)
         
-        del data["conversations"][conversation_id]
-        
-        if data["currentConvId"] == conversation_id:
-            data["currentConvId"] = "conv-default"
-        
-        if whatsapp_mgr.save_data(data):
-            return jsonify({"message": "Conversa deletada com sucesso"})
+        if whatsapp_mgr.delete_conversation(conversation_id):
+            return ojsonify({"message": "Conversa deletada com sucesso"})
         else:
-            return jsonify({"error": "Erro ao salvar alterações"}), 500
+            return ojsonify({"error": "Erro ao salvar alterações"}, 500)
             
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/conversations/<conversation_id>/messages', methods=['DELETE'])
 def clear_messages(conversation_id):
     """Limpa todas as mensagens de uma conversa"""
     try:
-        data = whatsapp_mgr.load_data()
-        
-        if conversation_id not in data["conversations"]:
-            return jsonify({"error": "Conversa não encontrada"}), 404
+        if not whatsapp_mgr.conversation_exists(conversation_id):
+            return ojsonify({"error": "Conversa não encontrada"}, 404)
         
-        data["conversations"][conversation_id]["messages"] = []
-        
-        if whatsapp_mgr.save_data(data):
-            return jsonify({"message": "Mensagens limpas com sucesso"})
+        if whatsapp_mgr.clear_messages(conversation_id):
+            return ojsonify({"message": "Mensagens limpas com sucesso"})
         else:
-            return jsonify({"error": "Erro ao salvar alterações"}), 500
+            return ojsonify({"error": "Erro ao salvar alterações"}, 500)
             
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/state', methods=['GET'])
 def get_state():
     """Retorna o estado completo da aplicação"""
     try:
-        data = whatsapp_mgr.load_data()
-        return jsonify(data)
+        data, etag = whatsapp_mgr.snapshot()
+        return conditional_json(data, etag)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/bot', methods=['POST'])
 def toggle_bot():
     """Ativa/desativa o bot simulado (legado)"""
     try:
-        data = whatsapp_mgr.load_data()
-        data["simulateBot"] = not data.get("simulateBot", False)
+        simulate_bot = whatsapp_mgr.toggle_setting("simulateBot")
         
-        if whatsapp_mgr.save_data(data):
-            return jsonify({"simulateBot": data["simulateBot"]})
+        if simulate_bot is not None:
+            return ojsonify({"simulateBot": simulate_bot})
         else:
-            return jsonify({"error": "Erro ao salvar configuração"}), 500
+            return ojsonify({"error": "Erro ao salvar configuração"}, 500)
             
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/gemini/toggle', methods=['POST'])
 def toggle_gemini():
     """Ativa/desativa o Gemini AI"""
     try:
-        data = whatsapp_mgr.load_data()
-        current_state = data.get("geminiEnabled", False)
-        data["geminiEnabled"] = not current_state
-        
-        if whatsapp_mgr.save_data(data):
-            return jsonify({
-                "geminiEnabled": data["geminiEnabled"],
-                "message": f"Gemini AI {'ativado' if data['geminiEnabled'] else 'desativado'}"
+        gemini_enabled = whatsapp_mgr.toggle_setting("geminiEnabled")
+        
+        if gemini_enabled is not None:
+            return ojsonify({
+                "geminiEnabled": gemini_enabled,
+                "message": f"Gemini AI {'ativado' if gemini_enabled else 'desativado'}"
             })
         else:
-            return jsonify({"error": "Erro ao salvar configuração"}), 500
+            return ojsonify({"error": "Erro ao salvar configuração"}, 500)
             
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/gemini/generate', methods=['POST'])
 def generate_with_gemini():
     """Gera resposta usando Gemini API"""
     try:
-        data = request.get_json()
-        if not data or 'prompt' not in data:
-            return jsonify({'error': 'Prompt é obrigatório'}), 400
+        try:
+            data = msgspec.json.decode(request.get_data(), type=GenerateRequest)
+        except msgspec.ValidationError as e:
+            return ojsonify({'error': f'Dados inválidos: {e}'}, 400)
+        except msgspec.DecodeError:
+            return ojsonify({'error': 'Prompt é obrigatório'}, 400)
         
-        conversation_context = data.get('context', [])
-        gemini_response = gemini_mgr.generate_response(data['prompt'], conversation_context)
+        gemini_response = gemini_mgr.generate_response(data.prompt, data.context)
         
         if gemini_response.get('status') == 'success':
-            return jsonify(gemini_response)
+            return ojsonify(gemini_response)
         else:
-            return jsonify({'error': gemini_response.get('error', 'Erro desconhecido')}), 500
+            return ojsonify({'error': gemini_response.get('error', 'Erro desconhecido')}, 500)
             
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/gemini/status', methods=['GET'])
 def get_gemini_status():
     """Retorna o status do Gemini AI"""
     try:
-        data = whatsapp_mgr.load_data()
-        return jsonify({
-            "geminiEnabled": data.get("geminiEnabled", False),
-            "apiConfigured": bool(API_KEY)
-        })
+        return Response(whatsapp_mgr.gemini_status_json(bool(API_KEY)), mimetype='application/json')
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 # Servir o frontend
 @app.route('/')
 def serve_frontend():
     return render_template('index.html')
 
-# Servir arquivos estáticos
-@app.route('/static/<path:path>')
-def serve_static(path):
-    return app.send_static_file(path)
-
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({"error": "Endpoint não encontrado"}), 404
+    return ojsonify({"error": "Endpoint não encontrado"}, 404)
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({"error": "Erro interno do servidor"}), 500
+    return ojsonify({"error": "Erro interno do servidor"}, 500)
 
 if __name__ == '__main__':
-    whatsapp_mgr.init_default_data()
+    # O servidor roda no gunicorn (ver gunicorn.conf.py); aqui só os dados são preparados
     print("🤖 WhatsApp Web com Gemini AI inicializado!")
+    print("🚀 Inicie o servidor com: gunicorn app:app")
     print("📱 Acesse: http://localhost:5000")
-    print("🔧 Gemini AI:", "Configurado" if API_KEY else "Não configurado")
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    print("🔧 Gemini AI:", "Configurado" if API_KEY else "Não configurado")
\ No newline at end of file
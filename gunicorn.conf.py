@@ -0,0 +1,7 @@
+# Configuração do gunicorn: gunicorn app:app
+# Workers gevent: as chamadas ao Gemini (I/O) não bloqueiam as demais requisições
+
+bind = "0.0.0.0:5000"
+workers = 4
+worker_class = "gevent"
+worker_connections = 500
@@ -130,6 +130,55 @@ async function sendMessage(convId, messageData) {
     }
 }
 
+// Resposta do Gemini via Server-Sent Events: o texto aparece conforme é gerado
+function streamGeminiReply(convId) {
+    const reply = {
+        id: 'stream-' + Date.now(),
+        who: 'their',
+        text: '',
+        ts: nowIso(),
+        status: 'delivered'
+    };
+    const source = new EventSource(`${API_BASE}/conversations/${convId}/stream`);
+    showTyping();
+    
+    // O polling pode substituir a lista de mensagens no meio do stream
+    const upsert = (message) => {
+        const conv = state.conversations[convId];
+        if (!conv) return;
+        const index = conv.messages.findIndex(m => m.id === reply.id || m.id === message.id);
+        if (index === -1) {
+            conv.messages.push(message);
+        } else {
+            conv.messages[index] = message;
+        }
+        if (convId === state.currentConvId) {
+            renderMessages();
+        }
+    };
+    
+    source.onmessage = (event) => {
+        hideTyping();
+        reply.text += JSON.parse(event.data).text;
+        upsert(reply);
+    };
+    
+    source.addEventListener('done', (event) => {
+        source.close();
+        upsert(JSON.parse(event.data));
+    });
+    
+    source.addEventListener('error', (event) => {
+        // Erro enviado pelo servidor (event.data) ou falha da conexão
+        source.close();
+        hideTyping();
+        if (event.data) {
+            log('Erro no streaming do Gemini:', JSON.parse(event.data).error);
+        }
+        render(true);
+    });
+}
+
 async function deleteConversation(convId) {
     try {
         await apiRequest(`/conversations/${convId}`, {
@@ -432,10 +481,13 @@ el.send.addEventListener('click', async () => {
         
         el.editor.textContent = '';
         
-        const message = await sendMessage(state.currentConvId, {
+        const convId = state.currentConvId;
+        const streamReply = state.geminiEnabled;
+        const message = await sendMessage(convId, {
             who: 'mine',
             text: text,
-            status: 'sent'
+            status: 'sent',
+            stream: streamReply
         });
         
         if (state.conversations[state.currentConvId]) {
@@ -448,6 +500,10 @@ el.send.addEventListener('click', async () => {
             renderMessages();
         }
         
+        if (streamReply) {
+            streamGeminiReply(convId);
+        }
+        
     } catch (error) {
         log('Erro ao enviar mensagem:', error.message);
         if (state.conversations[state.currentConvId]) {